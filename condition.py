@@ -1,5 +1,9 @@
 from typing import Dict, Any
 from autotask.nodes import Node, register_node, ConditionalNode
+from .truth import is_truthy
+
+# 按条件结果索引分支名称：False -> 0, True -> 1
+_BRANCHES = ("false_branch", "true_branch")
 
 @register_node
 class ConditionNode(ConditionalNode):
@@ -11,7 +15,7 @@ class ConditionNode(ConditionalNode):
     INPUTS = {
         "value": {
             "label": "输入值",
-            "description": "要判断的值，非空且非False时执行true分支",
+            "description": "要判断的值；列表、元组或数组中任一元素为真时执行true分支(空容器为假)，其它值非空且非False时执行true分支",
             "type": "ANY",
             "required": True
         }
@@ -35,8 +39,7 @@ class ConditionNode(ConditionalNode):
             value = node_inputs.get("value")
             workflow_logger.debug(f"条件判断输入值: {value}")
             
-            # Python的真值判断
-            result = bool(value)
+            result = is_truthy(value)
             workflow_logger.debug(f"条件判断结果: {result}")
 
             return {
@@ -52,4 +55,4 @@ class ConditionNode(ConditionalNode):
 
     def get_active_branch(self, outputs: Dict[str, Any]) -> str:
         """返回激活的分支名称"""
-        return "true_branch" if outputs.get("condition_result") else "false_branch"
+        return _BRANCHES[bool(outputs.get("condition_result"))]
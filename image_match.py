@@ -0,0 +1,79 @@
+"""图像模板匹配，仅依赖OpenCV/numpy，供ImageClickNode使用"""
+import cv2
+
+# 图像金字塔层数，每层分辨率减半；模板缩小后小于该尺寸时不再继续下采样，
+# 因此边长小于 2*PYRAMID_MIN_SIZE 的模板直接在原图上匹配
+PYRAMID_LEVELS = 2
+PYRAMID_MIN_SIZE = 16
+# 粗匹配阶段保留的候选位置数量
+PYRAMID_TOP_K = 3
+
+
+def build_pyramid(template, levels=PYRAMID_LEVELS):
+    """构建模板的下采样金字塔，第0层为原图"""
+    pyramid = [template]
+    for _ in range(levels):
+        th, tw = pyramid[-1].shape[:2]
+        if th // 2 < PYRAMID_MIN_SIZE or tw // 2 < PYRAMID_MIN_SIZE:
+            break
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return pyramid
+
+
+def best_match(screen, template):
+    """返回模板在截图中的最高匹配度及其左上角坐标"""
+    res = cv2.matchTemplate(screen, template, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(res)
+    return max_val, max_loc
+
+
+def _coarse_peaks(coarse, coarse_tpl, k=PYRAMID_TOP_K):
+    """返回低分辨率匹配结果中互不重叠的前k个候选左上角坐标"""
+    res = cv2.matchTemplate(coarse, coarse_tpl, cv2.TM_CCOEFF_NORMED)
+    th, tw = coarse_tpl.shape[:2]
+    peaks = []
+    for _ in range(k):
+        _, _, _, (x, y) = cv2.minMaxLoc(res)
+        peaks.append((x, y))
+        # 抑制该候选附近的响应，避免下一个候选落在同一位置
+        res[max(0, y - th // 2):y + th // 2 + 1, max(0, x - tw // 2):x + tw // 2 + 1] = -1.0
+    return peaks
+
+
+def match_template(screen, template_pyr, confidence):
+    """在截图中由粗到细匹配模板，找到时返回中心坐标(x, y)，否则返回None
+
+    先在金字塔最顶层做低分辨率匹配得到若干候选位置，再在原分辨率下
+    仅对候选位置附近的小窗口重新匹配。候选均未达到匹配度时回退到
+    原图全图匹配，因此结果与直接全图匹配一致。
+    """
+    template = template_pyr[0]
+    th, tw = template.shape[:2]
+    sh, sw = screen.shape[:2]
+    if sh < th or sw < tw:
+        return None
+
+    level = len(template_pyr) - 1
+    if level:
+        coarse = screen
+        for _ in range(level):
+            coarse = cv2.pyrDown(coarse)
+        coarse_tpl = template_pyr[level]
+
+        if coarse.shape[0] >= coarse_tpl.shape[0] and coarse.shape[1] >= coarse_tpl.shape[1]:
+            scale = 2 ** level
+            for cx, cy in _coarse_peaks(coarse, coarse_tpl):
+                cx, cy = cx * scale, cy * scale
+                # 在候选位置周围取 (2·tw)×(2·th) 的窗口做精确匹配
+                x0 = max(0, min(cx - tw // 2, sw - tw))
+                y0 = max(0, min(cy - th // 2, sh - th))
+                window = screen[y0:min(sh, y0 + 2 * th), x0:min(sw, x0 + 2 * tw)]
+                max_val, max_loc = best_match(window, template)
+                if max_val >= confidence:
+                    return x0 + max_loc[0] + tw // 2, y0 + max_loc[1] + th // 2
+
+    # 无法下采样或候选均未命中时，在原图上完整匹配
+    max_val, max_loc = best_match(screen, template)
+    if max_val < confidence:
+        return None
+    return max_loc[0] + tw // 2, max_loc[1] + th // 2
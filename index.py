@@ -1,11 +1,300 @@
 from typing import Dict, Any, Generator
 from autotask.nodes import Node, GeneratorNode, register_node
-import pyautogui
 import time
 import os
 import platform
-import pyperclip
 import traceback
+import logging
+import functools
+import asyncio
+import ctypes
+import ctypes.wintypes
+import subprocess
+
+
+def _read_pause_env():
+    """读取AUTOTASK_PYAUTOGUI_PAUSE，取值无效时记录警告并使用0，避免插件加载失败"""
+    value = os.environ.get("AUTOTASK_PYAUTOGUI_PAUSE", "0")
+    try:
+        pause = float(value)
+    except ValueError:
+        pause = -1.0
+    if not pause >= 0:  # 同时排除负数和nan
+        logging.getLogger(__name__).warning(
+            f"AUTOTASK_PYAUTOGUI_PAUSE取值无效: {value!r}，已使用默认值0"
+        )
+        return 0.0
+    return pause
+
+
+# pyautogui默认每次调用后暂停0.1秒，自动化流程中不需要，可通过环境变量恢复
+_PYAUTOGUI_PAUSE = _read_pause_env()
+
+
+# pyautogui/pyperclip/cv2导入时会加载PIL、截图后端、OpenCV等，延迟到首次使用时再导入
+@functools.cache
+def _get_pyautogui():
+    import pyautogui
+
+    pyautogui.PAUSE = _PYAUTOGUI_PAUSE
+    return pyautogui
+
+
+@functools.cache
+def _get_pyperclip():
+    import pyperclip
+
+    return pyperclip
+
+
+@functools.cache
+def _get_cv2():
+    import cv2
+
+    return cv2
+
+
+@functools.cache
+def _get_image_match():
+    from . import image_match
+
+    return image_match
+
+
+# 上一步失败时各节点返回的公共结果
+_SKIP_RESULT_BASE = {"success": False, "error_message": "上一步执行失败，跳过当前节点"}
+
+_SYSTEM = platform.system()
+_IS_MAC = _SYSTEM == "Darwin"
+# 粘贴快捷键：macOS为command+v，Windows/Linux为ctrl+v
+_PASTE_KEYS = ("command", "v") if _IS_MAC else ("ctrl", "v")
+
+
+# Windows SendInput 相关结构体
+class _MOUSEINPUT(ctypes.Structure):
+    _fields_ = [
+        ("dx", ctypes.c_long),
+        ("dy", ctypes.c_long),
+        ("mouseData", ctypes.c_ulong),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", ctypes.c_ushort),
+        ("wScan", ctypes.c_ushort),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("mi", _MOUSEINPUT), ("ki", _KEYBDINPUT)]
+
+
+class _INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("union", _INPUTUNION)]
+
+
+_INPUT_MOUSE = 0
+_INPUT_KEYBOARD = 1
+_MOUSEEVENTF_LEFTDOWN = 0x0002
+_MOUSEEVENTF_LEFTUP = 0x0004
+_KEYEVENTF_KEYUP = 0x0002
+_KEYEVENTF_UNICODE = 0x0004
+_VK_RETURN = 0x0D
+
+
+def _mouse_input(flags):
+    return _INPUT(type=_INPUT_MOUSE, union=_INPUTUNION(mi=_MOUSEINPUT(dwFlags=flags)))
+
+
+def _key_input(vk=0, scan=0, flags=0):
+    return _INPUT(
+        type=_INPUT_KEYBOARD,
+        union=_INPUTUNION(ki=_KEYBDINPUT(wVk=vk, wScan=scan, dwFlags=flags)),
+    )
+
+
+def _send_inputs(inputs):
+    """通过一次SendInput调用提交一组输入事件"""
+    arr = (_INPUT * len(inputs))(*inputs)
+    return ctypes.windll.user32.SendInput(len(inputs), arr, ctypes.sizeof(_INPUT))
+
+
+def _type_unicode(text):
+    """Windows下通过KEYEVENTF_UNICODE直接输入任意字符，不经过剪贴板"""
+    inputs = []
+    for line_no, line in enumerate(text.replace("\r\n", "\n").replace("\r", "\n").split("\n")):
+        # 多数控件不把UNICODE形式的换行符当作回车，换行改为发送VK_RETURN
+        if line_no:
+            inputs.append(_key_input(vk=_VK_RETURN))
+            inputs.append(_key_input(vk=_VK_RETURN, flags=_KEYEVENTF_KEYUP))
+        data = line.encode("utf-16-le")
+        # 按UTF-16码元逐个发送，超出BMP的字符会以代理对形式发送
+        for i in range(0, len(data), 2):
+            unit = int.from_bytes(data[i:i + 2], "little")
+            inputs.append(_key_input(scan=unit, flags=_KEYEVENTF_UNICODE))
+            inputs.append(_key_input(scan=unit, flags=_KEYEVENTF_UNICODE | _KEYEVENTF_KEYUP))
+    if inputs:
+        _send_inputs(inputs)
+
+
+def _hotkey_inputs(keys):
+    """Windows下将组合键解析为一次按下/抬起的SendInput事件序列
+
+    非Windows平台或存在无法映射为虚拟键码的按键时返回None，由调用方回退到pyautogui。
+    """
+    if _SYSTEM != "Windows":
+        return None
+    # _pyautogui_win是pyautogui的私有模块，结构变化时回退到pyautogui.hotkey
+    try:
+        from pyautogui import _pyautogui_win
+
+        keyboard_mapping = _pyautogui_win.keyboardMapping
+    except (ImportError, AttributeError):
+        return None
+
+    vks = []
+    for key in keys:
+        vk = keyboard_mapping.get(key if len(key) == 1 else key.lower())
+        # 需要额外shift的字符(高字节非0)或无法映射的键交给pyautogui处理
+        if vk is None or not 0 < vk <= 0xFF:
+            return None
+        vks.append(vk)
+
+    press = [_key_input(vk=vk) for vk in vks]
+    press += [_key_input(vk=vk, flags=_KEYEVENTF_KEYUP) for vk in reversed(vks)]
+    return press
+
+
+# OpenApplicationNode启动且仍在运行的进程，持有引用以免Popen对象被回收时产生ResourceWarning
+_LAUNCHED_PROCESSES = []
+
+
+def _has_process_window(pid):
+    """Windows下判断指定进程是否已创建可见的顶层窗口"""
+    user32 = ctypes.windll.user32
+    found = False
+
+    @ctypes.WINFUNCTYPE(ctypes.wintypes.BOOL, ctypes.wintypes.HWND, ctypes.wintypes.LPARAM)
+    def callback(hwnd, _):
+        nonlocal found
+        owner = ctypes.c_ulong()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+        if owner.value == pid and user32.IsWindowVisible(hwnd):
+            found = True
+            return False  # 找到后停止枚举
+        return True
+
+    user32.EnumWindows(callback, 0)
+    return found
+
+
+@functools.cache
+def _get_native_click():
+    """按平台选择原生点击实现，不支持的平台返回None(回退到pyautogui)
+
+    返回的函数签名为click(x, y, click_state)，click_state为连续点击中的第几次。
+    """
+    if _SYSTEM == "Windows":
+        user32 = ctypes.windll.user32
+        left_click = (_mouse_input(_MOUSEEVENTF_LEFTDOWN), _mouse_input(_MOUSEEVENTF_LEFTUP))
+
+        def click(x, y, click_state=1):
+            user32.SetCursorPos(int(x), int(y))
+            _send_inputs(left_click)
+
+        return click
+
+    if _SYSTEM == "Darwin":
+        try:
+            import Quartz
+        except ImportError:
+            return None
+
+        def click(x, y, click_state=1):
+            pos = (x, y)
+            for event_type in (
+                Quartz.kCGEventMouseMoved,
+                Quartz.kCGEventLeftMouseDown,
+                Quartz.kCGEventLeftMouseUp,
+            ):
+                event = Quartz.CGEventCreateMouseEvent(
+                    None, event_type, pos, Quartz.kCGMouseButtonLeft
+                )
+                # macOS依据click state区分单击/双击/三击，需显式设置
+                Quartz.CGEventSetIntegerValueField(
+                    event, Quartz.kCGMouseEventClickState, click_state
+                )
+                Quartz.CGEventPost(Quartz.kCGHIDEventTap, event)
+
+        return click
+
+    if _SYSTEM == "Linux":
+        try:
+            from Xlib import X
+            from Xlib.display import Display
+            from Xlib.ext import xtest
+
+            display = Display()
+        except Exception:
+            return None
+
+        def click(x, y, click_state=1):
+            xtest.fake_input(display, X.MotionNotify, x=int(x), y=int(y))
+            xtest.fake_input(display, X.ButtonPress, 1)
+            xtest.fake_input(display, X.ButtonRelease, 1)
+            display.sync()
+
+        return click
+
+    return None
+
+
+def _grab_screen(region=None, grayscale=False, max_age=0.1):
+    """截取当前屏幕(或指定区域)，返回灰度或BGR格式的numpy数组
+
+    全屏截图会复用max_age秒内的共享缓存；指定区域时只截取该区域，不经过缓存。
+    """
+    import numpy as np
+
+    cv2 = _get_cv2()
+    if region:
+        screen = np.asarray(_get_pyautogui().screenshot(region=region))
+    else:
+        screen = BaseRPANode.get_screenshot(max_age)
+    if grayscale:
+        return cv2.cvtColor(screen, cv2.COLOR_RGB2GRAY)
+    return cv2.cvtColor(screen, cv2.COLOR_RGB2BGR)
+
+
+# ImageClickNode支持的图像格式
+_VALID_EXTS = frozenset({".png", ".jpg", ".jpeg", ".bmp"})
+
+# 已解码的模板缓存，键为(路径, 修改时间, 是否灰度)
+_TEMPLATE_CACHE: Dict[tuple, Any] = {}
+
+
+def _load_template(path, mtime, grayscale=False):
+    """读取并缓存模板图像，mtime变化时重新加载；读取失败返回None"""
+    key = (path, mtime, grayscale)
+    template = _TEMPLATE_CACHE.get(key)
+    if template is None:
+        cv2 = _get_cv2()
+        template = cv2.imread(path, cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR)
+        if template is None:
+            return None
+        # 清理同一文件旧版本的缓存
+        for stale in [k for k in _TEMPLATE_CACHE if k[0] == path and k[1] != mtime]:
+            del _TEMPLATE_CACHE[stale]
+        _TEMPLATE_CACHE[key] = template
+    return template
+
 
 class RPANodeMeta(type):
     """RPA节点的元类，用于处理输入输出的合并"""
@@ -13,19 +302,21 @@ class RPANodeMeta(type):
     def __new__(mcs, name, bases, attrs):
         # 如果不是基类，则合并输入输出
         if name != "BaseRPANode":
-            # 合并INPUTS
+            # 基类已合并好的输入输出缓存在_MERGED_BASE_*上，无需重复遍历MRO
             base_inputs = {}
+            base_outputs = {}
             for base in bases:
-                if hasattr(base, "BASE_INPUTS"):
-                    base_inputs.update(base.BASE_INPUTS)
-            attrs["INPUTS"] = {**base_inputs, **attrs.get("INPUTS", {})}
+                base_inputs |= getattr(base, "_MERGED_BASE_INPUTS", getattr(base, "BASE_INPUTS", {}))
+                base_outputs |= getattr(base, "_MERGED_BASE_OUTPUTS", getattr(base, "BASE_OUTPUTS", {}))
+            # 缓存值包含当前类自己定义的BASE_*，供其子类继续合并
+            attrs["_MERGED_BASE_INPUTS"] = base_inputs | attrs.get("BASE_INPUTS", {})
+            attrs["_MERGED_BASE_OUTPUTS"] = base_outputs | attrs.get("BASE_OUTPUTS", {})
+
+            # 合并INPUTS
+            attrs["INPUTS"] = base_inputs | attrs.get("INPUTS", {})
 
             # 合并OUTPUTS
-            base_outputs = {}
-            for base in bases:
-                if hasattr(base, "BASE_OUTPUTS"):
-                    base_outputs.update(base.BASE_OUTPUTS)
-            attrs["OUTPUTS"] = {**base_outputs, **attrs.get("OUTPUTS", {})}
+            attrs["OUTPUTS"] = base_outputs | attrs.get("OUTPUTS", {})
 
         return super().__new__(mcs, name, bases, attrs)
 
@@ -50,10 +341,34 @@ class BaseRPANode(Node, metaclass=RPANodeMeta):
         },
     }
 
+    # 每次pyautogui调用后的暂停时间(秒)，子类可覆盖
+    PAUSE = _PYAUTOGUI_PAUSE
+
+    # 节点间共享的最近一次全屏截图，(截取时间, RGB数组)，整体替换以保证读写一致
+    _last_screenshot = None
+
     def __init__(self):
         super().__init__()
         # 不再需要在这里合并输入输出
 
+    @staticmethod
+    def get_screenshot(max_age=0.1):
+        """返回全屏截图，max_age秒内的截图直接复用"""
+        now = time.monotonic()
+        cached = BaseRPANode._last_screenshot
+        if cached is not None and now - cached[0] < max_age:
+            return cached[1]
+        import numpy as np
+
+        screen = np.asarray(_get_pyautogui().screenshot())
+        BaseRPANode._last_screenshot = (now, screen)
+        return screen
+
+    @staticmethod
+    def invalidate_screenshot():
+        """屏幕内容可能已改变(点击、按键、输入、打开窗口)时丢弃缓存的截图"""
+        BaseRPANode._last_screenshot = None
+
     def execute(self, node_inputs: Dict[str, Any], workflow_logger) -> Dict[str, Any]:
         # 如果没有传入workflow_logger，使用默认logger
         log = workflow_logger
@@ -93,31 +408,37 @@ class MouseClickNode(BaseRPANode):
 
     async def execute(self, node_inputs: Dict[str, Any], workflow_logger) -> Dict[str, Any]:
         log = workflow_logger
-        start_time = time.time()
+        t0 = time.monotonic_ns()
         try:
             # 检查上一步是否成功
             previous_result = node_inputs.get("previous_result", {})
             if previous_result and not previous_result.get("success", True):
-                return {
-                    "success": False,
-                    "error_message": "上一步执行失败，跳过当前节点",
-                    "execution_time": time.time() - start_time,
-                }
+                return {**_SKIP_RESULT_BASE, "execution_time": (time.monotonic_ns() - t0) / 1e9}
+
+            pyautogui = _get_pyautogui()
+            pyautogui.PAUSE = self.PAUSE
 
             x = node_inputs["x"]
             y = node_inputs["y"]
+            clicks = node_inputs.get("clicks", 1)
+            interval = node_inputs.get("interval", 0.25)
             log.debug(f"执行鼠标点击: x={x}, y={y}")
-            pyautogui.click(
-                x=x,
-                y=y,
-                clicks=node_inputs.get("clicks", 1),
-                interval=node_inputs.get("interval", 0.25),
-            )
+            native_click = _get_native_click()
+            if native_click:
+                for i in range(clicks):
+                    if i:
+                        await asyncio.sleep(interval)
+                    # 原生点击绕过了pyautogui，需自行检查鼠标是否移到屏幕角落(紧急停止)
+                    pyautogui.failSafeCheck()
+                    native_click(x, y, i + 1)
+            else:
+                pyautogui.click(x=x, y=y, clicks=clicks, interval=interval)
 
+            self.invalidate_screenshot()
             return {
                 "success": True,
                 "error_message": "",
-                "execution_time": time.time() - start_time,
+                "execution_time": (time.monotonic_ns() - t0) / 1e9,
                 "click_position": {"x": x, "y": y},
             }
         except Exception as e:
@@ -126,7 +447,7 @@ class MouseClickNode(BaseRPANode):
             return {
                 "success": False,
                 "error_message": error_msg,
-                "execution_time": time.time() - start_time,
+                "execution_time": (time.monotonic_ns() - t0) / 1e9,
                 "click_position": None,
             }
 
@@ -149,89 +470,169 @@ class ImageClickNode(BaseRPANode):
             "default": 0.8,
             "step": 0.03,
         },
+        "grayscale": {
+            "label": "灰度匹配",
+            "description": "转为灰度后再匹配，速度更快但会忽略颜色差异",
+            "type": "BOOLEAN",
+            "default": True,
+        },
         "wait_time": {
             "label": "等待时间",
             "description": "等待图像出现的最长时间(秒)",
             "type": "FLOAT",
             "default": 1.0,
         },
+        "region_x": {
+            "label": "区域X坐标",
+            "description": "搜索区域左上角的X坐标，留空则搜索全屏",
+            "type": "INT",
+            "required": False,
+        },
+        "region_y": {
+            "label": "区域Y坐标",
+            "description": "搜索区域左上角的Y坐标，留空则搜索全屏",
+            "type": "INT",
+            "required": False,
+        },
+        "region_w": {
+            "label": "区域宽度",
+            "description": "搜索区域的宽度，留空则搜索全屏",
+            "type": "INT",
+            "required": False,
+        },
+        "region_h": {
+            "label": "区域高度",
+            "description": "搜索区域的高度，留空则搜索全屏",
+            "type": "INT",
+            "required": False,
+        },
     }
 
     async def execute(self, node_inputs: Dict[str, Any], workflow_logger) -> Dict[str, Any]:
         log = workflow_logger
-        start_time = time.time()
+        t0 = time.monotonic_ns()
         try:
             print(node_inputs)
             # 检查上一步是否成功
             previous_result = node_inputs.get("previous_result", {})
             if previous_result and not previous_result.get("success", True):
                 log.debug("上一步执行失败，跳过当前节点")
-                return {
-                    "success": False,
-                    "error_message": "上一步执行失败，跳过当前节点",
-                    "execution_time": time.time() - start_time,
-                }
+                return {**_SKIP_RESULT_BASE, "execution_time": (time.monotonic_ns() - t0) / 1e9}
+
+            pyautogui = _get_pyautogui()
+            pyautogui.PAUSE = self.PAUSE
 
             # 添加图像文件验证
             image_path = node_inputs["target_img"]
             log.debug(f"尝试查找图像文件: {image_path}")
 
-            if not os.path.exists(image_path):
+            # 一次stat同时完成存在性检查并取得大小、修改时间
+            try:
+                st = os.stat(image_path)
+            except FileNotFoundError:
                 log.error(f"图像文件不存在: {image_path}")
                 return {
                     "success": False,
                     "error_message": f"图像文件不存在: {image_path}",
-                    "execution_time": time.time() - start_time,
+                    "execution_time": (time.monotonic_ns() - t0) / 1e9,
+                    "image_found": False,
+                    "click_position": None,
+                }
+            except OSError as e:
+                log.error(f"无法访问图像文件: {image_path}, {e}")
+                return {
+                    "success": False,
+                    "error_message": f"无法访问图像文件: {image_path}, {e}",
+                    "execution_time": (time.monotonic_ns() - t0) / 1e9,
                     "image_found": False,
                     "click_position": None,
                 }
 
             # 验证图像文件格式
-            valid_extensions = (".png", ".jpg", ".jpeg", ".bmp")
-            if not image_path.lower().endswith(valid_extensions):
+            ext = os.path.splitext(image_path)[1].lower()
+            if ext not in _VALID_EXTS:
                 log.error(f"不支持的图像格式: {image_path}")
                 return {
                     "success": False,
-                    "error_message": f"不支持的图像格式，请使用以下格式: {valid_extensions}",
-                    "execution_time": time.time() - start_time,
+                    "error_message": f"不支持的图像格式，请使用以下格式: {sorted(_VALID_EXTS)}",
+                    "execution_time": (time.monotonic_ns() - t0) / 1e9,
+                    "image_found": False,
+                    "click_position": None,
+                }
+
+            if st.st_size == 0:
+                log.error(f"图像文件为空或已损坏: {image_path}")
+                return {
+                    "success": False,
+                    "error_message": f"图像文件为空或已损坏: {image_path}",
+                    "execution_time": (time.monotonic_ns() - t0) / 1e9,
                     "image_found": False,
                     "click_position": None,
                 }
 
             wait_time = node_inputs.get("wait_time", 10)
             confidence = node_inputs.get("confidence", 0.9)
+            grayscale = node_inputs.get("grayscale", True)
             log.debug(f"开始查找图像，等待时间: {wait_time}秒, 匹配度: {confidence}")
 
-            end_time = time.time() + wait_time
+            # 仅当区域四个参数都提供时才限定搜索区域
+            region = tuple(
+                node_inputs.get(k) for k in ("region_x", "region_y", "region_w", "region_h")
+            )
+            if any(v is None or v == "" for v in region):
+                region = None
+            else:
+                region = tuple(int(v) for v in region)
+                log.debug(f"限定搜索区域: {region}")
+
+            # 模板只加载一次(跨调用缓存)，循环中仅重新截图
+            template = _load_template(image_path, st.st_mtime, grayscale)
+            if template is None:
+                log.error(f"无法读取图像文件: {image_path}")
+                return {"result": False}
+            image_match = _get_image_match()
+            template_pyr = image_match.build_pyramid(template)
+
+            end_time = time.monotonic() + wait_time
             attempts = 0
 
             # 循环尝试查找图像，直到超时
-            while time.time() < end_time:
+            while time.monotonic() < end_time:
                 attempts += 1
                 try:
                     log.debug(f"第 {attempts} 次尝试查找图像...")
-                    location = pyautogui.locateCenterOnScreen(
-                        image_path, confidence=confidence
+                    # 仅首次尝试复用其他节点刚截取的画面，重试时必须重新截图
+                    max_age = 0.1 if attempts == 1 else 0
+                    # 截图和模板匹配耗时较长，放到线程中执行以免阻塞事件循环
+                    location = await asyncio.to_thread(
+                        lambda: image_match.match_template(
+                            _grab_screen(region, grayscale, max_age), template_pyr, confidence
+                        )
                     )
 
+                    if location and region:
+                        # 区域截图中的坐标需转换回屏幕绝对坐标
+                        location = (location[0] + region[0], location[1] + region[1])
+
                     if location:
-                        log.info(f"找到图像，位置: x={location.x}, y={location.y}")
+                        log.info(f"找到图像，位置: x={location[0]}, y={location[1]}")
                         log.debug("执行点击操作...")
-                        pyautogui.click(location)
+                        pyautogui.click(*location)
+                        self.invalidate_screenshot()
                         return {"result": True}
                         # return {
                         #     "success": True,
                         #     "error_message": "",
-                        #     "execution_time": time.time() - start_time,
+                        #     "execution_time": (time.monotonic_ns() - t0) / 1e9,
                         #     "image_found": True,
-                        #     "click_position": {"x": location.x, "y": location.y},
+                        #     "click_position": {"x": location[0], "y": location[1]},
                         # }
                 except Exception as e:
                     log.debug(f"单次查找失败: {str(e)}")
                     pass
 
-                # 短暂等待后继续尝试
-                time.sleep(0.5)
+                # 指数退避等待后继续尝试，从约30ms起步，最长200ms
+                await asyncio.sleep(min(0.2, 0.03 * 1.5 ** attempts))
 
             # 超时未找到图像
             log.warning(f"在 {wait_time} 秒内未找到目标图像，共尝试 {attempts} 次")
@@ -239,7 +640,7 @@ class ImageClickNode(BaseRPANode):
             # return {
             #     "success": False,
             #     "error_message": f"未找到目标图像 (尝试次数: {attempts})",
-            #     "execution_time": time.time() - start_time,
+            #     "execution_time": (time.monotonic_ns() - t0) / 1e9,
             #     "image_found": False,
             #     "click_position": None,
             # }
@@ -264,7 +665,7 @@ class OpenApplicationNode(BaseRPANode):
         },
         "wait_time": {
             "label": "等待时间",
-            "description": "等待应用程序启动的时间(秒)",
+            "description": "等待应用程序启动的最长时间(秒)，窗口出现后立即返回",
             "type": "FLOAT",
             "default": 2.0,
         },
@@ -272,17 +673,14 @@ class OpenApplicationNode(BaseRPANode):
 
     async def execute(self, node_inputs: Dict[str, Any], workflow_logger) -> Dict[str, Any]:
         log = workflow_logger
+        t0 = time.monotonic_ns()
         start_time = time.time()
         try:
             workflow_logger.info(f"开始执行打开应用程序: {node_inputs}")
             # 检查上一步是否成功
             previous_result = node_inputs.get("previous_result", {})
             if previous_result and not previous_result.get("success", True):
-                return {
-                    "success": False,
-                    "error_message": "上一步执行失败，跳过当前节点",
-                    "execution_time": time.time() - start_time,
-                }
+                return {**_SKIP_RESULT_BASE, "execution_time": (time.monotonic_ns() - t0) / 1e9}
 
             app_path = node_inputs["app_file"]
             wait_time = node_inputs.get("wait_time", 3)
@@ -294,16 +692,40 @@ class OpenApplicationNode(BaseRPANode):
                 raise FileNotFoundError(f"应用程序路径不存在: {app_path}")
 
             # 启动应用程序
-            os.startfile(app_path)
-            time.sleep(wait_time)  # 等待应用程序启动
+            pid = None
+            proc = None
+            if _SYSTEM == "Windows" and app_path.lower().endswith(".exe"):
+                try:
+                    # 与os.startfile一致，控制台程序使用独立的控制台窗口，不共享宿主的输入和Ctrl+C
+                    proc = subprocess.Popen(
+                        [app_path], shell=False, creationflags=subprocess.CREATE_NEW_CONSOLE
+                    )
+                except OSError as e:
+                    # 需要管理员权限的程序(WinError 740)等无法直接创建进程，交给ShellExecute处理
+                    log.debug(f"直接启动失败，改用系统方式打开: {e}")
+
+            if proc is not None:
+                pid = proc.pid
+                _LAUNCHED_PROCESSES[:] = [p for p in _LAUNCHED_PROCESSES if p.poll() is None]
+                _LAUNCHED_PROCESSES.append(proc)
+                # 每50ms检查一次进程窗口，窗口出现即返回，最多等待wait_time秒
+                end_time = time.monotonic() + wait_time
+                while time.monotonic() < end_time and not _has_process_window(pid):
+                    await asyncio.sleep(0.05)
+            else:
+                # 非可执行文件或无法直接启动的程序交给系统打开，无法探测窗口，按固定时间等待
+                os.startfile(app_path)
+                await asyncio.sleep(wait_time)  # 等待应用程序启动，期间不阻塞其他节点
 
+            self.invalidate_screenshot()
             return {
                 "success": True,
                 "error_message": "",
-                "execution_time": time.time() - start_time,
+                "execution_time": (time.monotonic_ns() - t0) / 1e9,
                 "process_info": {
                     "application_path": app_path,
                     "start_time": start_time,
+                    "pid": pid,
                 },
             }
 
@@ -314,7 +736,7 @@ class OpenApplicationNode(BaseRPANode):
             return {
                 "success": False,
                 "error_message": error_msg,
-                "execution_time": time.time() - start_time,
+                "execution_time": (time.monotonic_ns() - t0) / 1e9,
                 "process_info": None,
             }
 
@@ -322,7 +744,7 @@ class OpenApplicationNode(BaseRPANode):
 @register_node
 class TypeTextNode(BaseRPANode):
     NAME = "输入文本"
-    DESCRIPTION = "在当前位置粘贴文本"
+    DESCRIPTION = "在当前位置输入文本，默认通过剪贴板粘贴"
     INPUTS = {
         "text": {
             "label": "输入文本",
@@ -330,44 +752,60 @@ class TypeTextNode(BaseRPANode):
             "type": "STRING",
             "multiline": True,
             "required": True,
-        }
+        },
+        "direct_input": {
+            "label": "直接键入",
+            "description": "模拟键盘逐字输入而不使用剪贴板；输入法处于中文状态或编辑器有自动补全时结果可能不一致",
+            "type": "BOOLEAN",
+            "default": False,
+        },
     }
 
     async def execute(self, node_inputs: Dict[str, Any], workflow_logger) -> Dict[str, Any]:
         log = workflow_logger
-        start_time = time.time()
+        t0 = time.monotonic_ns()
         try:
             # 检查上一步是否成功
             previous_result = node_inputs.get("previous_result", {})
             if previous_result and not previous_result.get("success", True):
-                return {
-                    "success": False,
-                    "error_message": "上一步执行失败，跳过当前节点",
-                    "execution_time": time.time() - start_time,
-                }
+                return {**_SKIP_RESULT_BASE, "execution_time": (time.monotonic_ns() - t0) / 1e9}
 
-            # 保存原有剪贴板内容
-            original_clipboard = pyperclip.paste()
+            pyautogui = _get_pyautogui()
+            pyautogui.PAUSE = self.PAUSE
 
             text = node_inputs["text"]
             log.debug(f"执行文本输入: {text}")
 
-            # 设置新文本到剪贴板
-            pyperclip.copy(text)
+            direct_input = node_inputs.get("direct_input", False)
+            # 直接键入时统一换行符，保证两种键入方式中\r\n都只产生一次回车
+            typed = text.replace("\r\n", "\n") if direct_input else text
+
+            if direct_input and typed.isascii():
+                # ASCII文本直接模拟键入，不占用剪贴板
+                pyautogui.typewrite(typed, interval=0)
+            elif direct_input and _SYSTEM == "Windows":
+                # 原生输入绕过了pyautogui，需自行检查鼠标是否移到屏幕角落(紧急停止)
+                pyautogui.failSafeCheck()
+                _type_unicode(typed)
+            else:
+                pyperclip = _get_pyperclip()
+                # 保存原有剪贴板内容
+                original_clipboard = pyperclip.paste()
+
+                # 设置新文本到剪贴板
+                pyperclip.copy(text)
 
-            # 执行粘贴操作
-            if platform.system() == "Darwin":  # macOS
-                pyautogui.hotkey("command", "v")
-            else:  # Windows/Linux
-                pyautogui.hotkey("ctrl", "v")
+                # 执行粘贴操作
+                pyautogui.hotkey(*_PASTE_KEYS)
 
-            # 恢复原有剪贴板内容
-            pyperclip.copy(original_clipboard)
+                # 恢复原有剪贴板内容
+                pyperclip.copy(original_clipboard)
 
+            self.invalidate_screenshot()
             return {
                 "success": True,
                 "error_message": "",
-                "execution_time": time.time() - start_time,
+                "execution_time": (time.monotonic_ns() - t0) / 1e9,
                 "text_info": {"content": text, "length": len(text)},
             }
 
@@ -377,7 +815,7 @@ class TypeTextNode(BaseRPANode):
             return {
                 "success": False,
                 "error_message": error_msg,
-                "execution_time": time.time() - start_time,
+                "execution_time": (time.monotonic_ns() - t0) / 1e9,
                 "text_info": None,
             }
 
@@ -416,16 +854,15 @@ class KeyPressNode(BaseRPANode):
 
     async def execute(self, node_inputs: Dict[str, Any], workflow_logger) -> Dict[str, Any]:
         log = workflow_logger
-        start_time = time.time()
+        t0 = time.monotonic_ns()
         try:
             # 检查上一步是否成功
             previous_result = node_inputs.get("previous_result", {})
             if previous_result and not previous_result.get("success", True):
-                return {
-                    "success": False,
-                    "error_message": "上一步执行失败，跳过当前节点",
-                    "execution_time": time.time() - start_time,
-                }
+                return {**_SKIP_RESULT_BASE, "execution_time": (time.monotonic_ns() - t0) / 1e9}
+
+            pyautogui = _get_pyautogui()
+            pyautogui.PAUSE = self.PAUSE
 
             key = node_inputs["key"]
             modifiers_str = node_inputs.get("modifiers", "").strip()
@@ -443,18 +880,30 @@ class KeyPressNode(BaseRPANode):
 
             # 如果有组合键
             if modifiers:
-                for _ in range(presses):
-                    pyautogui.hotkey(*modifiers, key)
-                    if presses > 1:
-                        time.sleep(interval)
+                press = _hotkey_inputs([*modifiers, key])
+                if press and (presses == 1 or interval <= 0):
+                    # 间隔为0时所有次数的事件在一次SendInput调用中提交
+                    # 原生输入绕过了pyautogui，需自行检查鼠标是否移到屏幕角落(紧急停止)
+                    pyautogui.failSafeCheck()
+                    _send_inputs(press * presses)
+                else:
+                    for _ in range(presses):
+                        if press:
+                            pyautogui.failSafeCheck()
+                            _send_inputs(press)
+                        else:
+                            pyautogui.hotkey(*modifiers, key)
+                        if presses > 1:
+                            await asyncio.sleep(interval)
             else:
                 # 单个按键
                 pyautogui.press(key, presses=presses, interval=interval)
 
+            self.invalidate_screenshot()
             return {
                 "success": True,
                 "error_message": "",
-                "execution_time": time.time() - start_time,
+                "execution_time": (time.monotonic_ns() - t0) / 1e9,
                 "key_info": {"key": key, "modifiers": modifiers, "presses": presses},
             }
 
@@ -464,6 +913,6 @@ class KeyPressNode(BaseRPANode):
             return {
                 "success": False,
                 "error_message": error_msg,
-                "execution_time": time.time() - start_time,
+                "execution_time": (time.monotonic_ns() - t0) / 1e9,
                 "key_info": None,
             }
@@ -0,0 +1,71 @@
+import os
+import sys
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from image_match import PYRAMID_MIN_SIZE, build_pyramid, match_template  # noqa: E402
+
+
+def _make_screen(template, target, decoys, size=(600, 800), seed=0):
+    """生成带噪声背景的截图，在target放置模板原图，在decoys放置模糊后的相似图块"""
+    rng = np.random.default_rng(seed)
+    screen = rng.integers(0, 256, size=size, dtype=np.uint8)
+    screen = cv2.GaussianBlur(screen, (5, 5), 0)
+    th, tw = template.shape[:2]
+    blurred = cv2.GaussianBlur(template, (9, 9), 0)
+    for x, y in decoys:
+        screen[y:y + th, x:x + tw] = blurred
+    x, y = target
+    screen[y:y + th, x:x + tw] = template
+    return screen
+
+
+def _make_template(size=48, seed=1):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(size, size), dtype=np.uint8)
+
+
+def test_finds_exact_patch_among_similar_patches():
+    template = _make_template()
+    decoys = [(40, 40), (300, 60), (520, 400), (700, 100), (120, 480)]
+    target = (450, 220)
+    screen = _make_screen(template, target, decoys)
+
+    location = match_template(screen, build_pyramid(template), 0.95)
+
+    assert location == (target[0] + 24, target[1] + 24)
+
+
+def test_pyramid_result_matches_full_resolution_match():
+    template = _make_template()
+    decoys = [(x, y) for x in range(20, 760, 90) for y in (30, 300, 520)]
+    target = (610, 410)
+    screen = _make_screen(template, target, decoys, seed=2)
+
+    assert match_template(screen, build_pyramid(template), 0.95) == match_template(
+        screen, [template], 0.95
+    )
+
+
+def test_returns_none_when_below_confidence():
+    template = _make_template()
+    screen = _make_screen(template, (100, 100), [])
+    other = _make_template(seed=7)
+
+    assert match_template(screen, build_pyramid(other), 0.9) is None
+
+
+def test_small_template_is_not_downsampled():
+    template = _make_template(size=2 * PYRAMID_MIN_SIZE - 1)
+
+    assert len(build_pyramid(template)) == 1
+
+
+def test_template_larger_than_screen():
+    template = _make_template(size=64)
+    screen = np.zeros((32, 32), dtype=np.uint8)
+
+    assert match_template(screen, build_pyramid(template), 0.5) is None
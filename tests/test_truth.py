@@ -0,0 +1,44 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from truth import is_truthy  # noqa: E402
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        # 列表/元组：任一元素为真即为真，与元素顺序无关
+        ([], False),
+        ((), False),
+        ([0], False),
+        ([0, 0], False),
+        ([0, 1], True),
+        ([0.0, False], False),
+        ([0, ""], False),
+        (["", 0], False),
+        (["", "a"], True),
+        ([1, "a"], True),
+        ([1, [2, 3]], True),
+        ([0, []], False),
+        ([[], [0]], True),
+        # numpy数组
+        (np.zeros(3), False),
+        (np.array([0, 2]), True),
+        (np.array([]), False),
+        # 其它值使用Python真值判断
+        (None, False),
+        (0, False),
+        (1, True),
+        ("", False),
+        ("x", True),
+        ({}, False),
+        ({"a": 0}, True),
+    ],
+)
+def test_truth_table(value, expected):
+    assert is_truthy(value) is expected
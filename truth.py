@@ -0,0 +1,31 @@
+"""条件判断的真值规则，不依赖autotask宿主，供ConditionNode使用"""
+import sys
+
+
+def is_truthy(value):
+    """判断输入值是否为真
+
+    列表、元组和numpy数组按元素判断：任一元素为真即为真，空容器为假；
+    其它值使用Python的真值判断。数值列表会借助numpy一次性判断，结果与any()一致。
+    """
+    # numpy尚未导入时输入不可能是ndarray，无需为此导入numpy
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.ndarray):
+        # 数组判断是否存在为真的元素，由numpy向量化完成
+        return bool(value.any())
+
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], (int, float, bool)):
+            # 数值列表转为数组后一次性判断；混合类型或嵌套不规则时dtype不是数值，走any()
+            import numpy as np
+
+            try:
+                arr = np.asarray(value)
+            except ValueError:
+                arr = None
+            if arr is not None and arr.dtype.kind in "biuf":
+                return bool(arr.any())
+        return any(value)
+
+    # Python的真值判断
+    return bool(value)